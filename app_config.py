@@ -12,6 +12,13 @@ This module defines configuration classes for different environments:
 import os
 from datetime import timedelta
 
+# Production containers get their environment from the orchestrator, so
+# only read .env files (and import python-dotenv) outside production.
+if os.environ.get("FLASK_ENV", "development") != "production":
+    from dotenv import load_dotenv  # pylint: disable=import-outside-toplevel
+
+    load_dotenv()
+
 
 class BaseConfig:
     """Base configuration class with common settings."""
@@ -19,14 +26,31 @@ class BaseConfig:
     SECRET_KEY = os.environ.get("SECRET_KEY") or "dev-secret-key"
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL") or "sqlite:///app.db"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Schema is managed by init_db/migrations; opt in to create_all on boot
+    CREATE_DB_ON_STARTUP = os.environ.get("CREATE_DB_ON_STARTUP") == "1"
     WTF_CSRF_ENABLED = True  # Ensure CSRF protection is enabled
     SESSION_COOKIE_SECURE = True
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = "Lax"
     PERMANENT_SESSION_LIFETIME = timedelta(days=7)
     UPLOAD_FOLDER = os.path.join(os.getcwd(), "uploads")
-    # Add SESSION_TYPE configuration
-    SESSION_TYPE = "filesystem"  # Store session data in the filesystem
+    ALLOWED_EXTENSIONS = frozenset({"png", "jpg", "jpeg", "gif"})
+    REDIS_URL = os.environ.get("REDIS_URL")
+    # Keep sessions (and the cart) in Redis when available, else on disk
+    SESSION_TYPE = os.environ.get("SESSION_TYPE") or (
+        "redis" if REDIS_URL else "filesystem"
+    )
+    # Serialise stored sessions as binary msgpack rather than JSON
+    SESSION_SERIALIZATION_FORMAT = "msgpack"
+    # Optional HTTP extensions initialised by extensions.init_http_extensions
+    ENABLE_CORS = True
+    ENABLE_MAIL = True
+    # Share rate-limit counters between workers when Redis is available
+    RATELIMIT_STORAGE_URI = REDIS_URL or "memory://"
+    # bcrypt work factor; each increment doubles the hashing cost
+    BCRYPT_LOG_ROUNDS = int(os.environ.get("BCRYPT_LOG_ROUNDS", 12))
+    # WAL with synchronous=NORMAL on SQLite; trades durability for speed
+    SQLITE_FAST_PRAGMAS = False
 
 
 class DevelopmentConfig(BaseConfig):
@@ -35,6 +59,8 @@ class DevelopmentConfig(BaseConfig):
     DEBUG = True
     SQLALCHEMY_ECHO = True
     SESSION_COOKIE_SECURE = False
+    BCRYPT_LOG_ROUNDS = 4
+    SQLITE_FAST_PRAGMAS = True
 
 
 class TestingConfig(BaseConfig):
@@ -43,6 +69,8 @@ class TestingConfig(BaseConfig):
     TESTING = True
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    BCRYPT_LOG_ROUNDS = 4
+    SQLITE_FAST_PRAGMAS = True
 
 
 class ProductionConfig(BaseConfig):
@@ -61,3 +89,17 @@ config = {
 }
 
 Config = DevelopmentConfig  # Alias the default configuration
+
+
+def get_config(name=None):
+    """Return the configuration class for an environment.
+
+    Args:
+        name (str): The environment name. Defaults to ``FLASK_ENV``.
+
+    Returns:
+        type: The configuration class for the environment.
+    """
+    if name is None:
+        name = os.environ.get("FLASK_ENV", "default")
+    return config.get(name, config["default"])
@@ -0,0 +1,296 @@
+"""
+Application factory module.
+
+This module is the single place where the Flask application is built:
+it loads configuration, initialises the shared extensions from
+``extensions``, registers blueprints and seeds the database.
+"""
+
+# Standard library imports
+import atexit
+import logging
+import os
+import sys
+import weakref
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import Queue
+from typing import Any, Dict, Optional, Union
+
+# Third-party imports
+import orjson
+from flask import Flask, render_template
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+
+# Local imports
+from app_config import get_config
+from extensions import (
+    db,
+    login_manager,
+    limiter,
+    init_http_extensions,
+    init_migrations,
+)
+from models import Product, User, bcrypt
+from auth import auth as auth_blueprint
+from routes import main as main_blueprint
+
+SEED_PRODUCTS = (
+    {
+        "name": "Sample Product",
+        "description": "This is a sample product.",
+        "price": 9.99,
+        "stock": 100,
+        "featured": True,
+    },
+)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serialises responses with orjson.
+
+    Types orjson does not handle natively (Decimal, objects with
+    ``__html__``) fall back to Flask's default conversions. The compact
+    and ``indent=2`` layouts Flask asks for map to orjson options; any
+    other formatting arguments, and values orjson rejects (e.g. integers
+    wider than 64 bits), are handled by the stdlib provider.
+    """
+
+    def _orjson_option(self, kwargs: Dict[str, Any]) -> Optional[int]:
+        """Map ``json.dumps`` arguments to orjson options.
+
+        Args:
+            kwargs: The keyword arguments passed to ``dumps``.
+
+        Returns:
+            Optional[int]: The orjson options, or None if orjson cannot
+            produce the requested layout.
+        """
+        if kwargs.keys() - {"sort_keys", "indent", "separators"}:
+            return None
+        indent = kwargs.get("indent")
+        separators = tuple(kwargs.get("separators") or ())
+        option = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+        if indent is None:
+            if separators not in ((), (",", ":")):
+                return None
+        elif indent == 2 and separators in ((), (",", ": ")):
+            option |= orjson.OPT_INDENT_2
+        else:
+            return None
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialise ``obj`` to a JSON string."""
+        option = self._orjson_option(kwargs)
+        if option is not None:
+            try:
+                return orjson.dumps(obj, default=self.default, option=option).decode()
+            except orjson.JSONEncodeError:
+                pass
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """Deserialise a JSON string or bytes."""
+        return orjson.loads(s)
+
+
+@login_manager.user_loader
+def load_user(user_id: int) -> Optional[User]:
+    """Load a user from the database by ID.
+
+    Args:
+        user_id: The ID of the user to load.
+
+    Returns:
+        Optional[User]: The loaded user object, or None if unknown.
+    """
+    return db.session.get(User, int(user_id))
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Switch a new SQLite connection to WAL with relaxed fsync.
+
+    Args:
+        dbapi_connection: The raw DB-API connection being opened.
+        connection_record: The pool's record for the connection (unused).
+    """
+    # pylint: disable=unused-argument
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
+# Applications whose connection pools are reset in forked children
+_fork_safe_apps: "weakref.WeakSet[Flask]" = weakref.WeakSet()
+
+
+def _reset_pools_after_fork() -> None:
+    """Drop pooled connections inherited from the parent process.
+
+    ``close=False`` leaves the parent's sockets untouched while the child
+    starts with an empty pool of its own.
+    """
+    for app in list(_fork_safe_apps):
+        with app.app_context():
+            db.engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+_MIGRATION_CLIS = ("flask", "alembic")
+
+
+def _wants_migrations() -> bool:
+    """Return whether this process may run ``flask db`` commands."""
+    if os.environ.get("RUN_MIGRATIONS"):
+        return True
+    # ``python -m flask`` runs with argv[0] set to flask/__main__.py
+    main_spec = getattr(sys.modules.get("__main__"), "__spec__", None)
+    if main_spec is not None and main_spec.name.split(".")[0] in _MIGRATION_CLIS:
+        return True
+    program = os.path.basename(sys.argv[0])
+    return any(name in program for name in _MIGRATION_CLIS)
+
+
+def configure_logging(app: Flask) -> None:
+    """Send application logs to a rotating file through a background queue.
+
+    Request threads only enqueue records; a single listener thread performs
+    the file writes and rotation.
+
+    Args:
+        app: The Flask application whose logger is configured.
+    """
+    if any(isinstance(h, QueueHandler) for h in app.logger.handlers):
+        return
+
+    os.makedirs("logs", exist_ok=True)
+    file_handler = RotatingFileHandler(
+        "logs/app.log", maxBytes=10 * 1024 * 1024, backupCount=10
+    )
+    file_handler.setFormatter(
+        logging.Formatter(
+            "%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]"
+        )
+    )
+    file_handler.setLevel(logging.INFO)
+
+    log_queue: Queue = Queue(-1)
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    app.logger.addHandler(QueueHandler(log_queue))
+    app.logger.setLevel(logging.INFO)
+    app.extensions["log_listener"] = listener
+
+
+def create_app(config_class: Any = None, serve_http: bool = True) -> Flask:
+    """Create and configure the Flask application.
+
+    Args:
+        config_class: The configuration class to use. Defaults to the
+            class selected by ``FLASK_ENV``.
+        serve_http: Whether to initialise the HTTP-only extensions. CLI
+            and seeding entry points pass False.
+
+    Returns:
+        Flask: The configured Flask application.
+    """
+    app = Flask(__name__)
+    app.config.from_object(config_class or get_config())
+    app.json = OrjsonProvider(app)
+
+    # Validate pooled connections on checkout and recycle long-lived ones
+    engine_options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}))
+    engine_options.update({"pool_pre_ping": True, "pool_recycle": 1800})
+    is_sqlite = app.config["SQLALCHEMY_DATABASE_URI"].startswith("sqlite")
+    if not is_sqlite:
+        engine_options.update({"pool_size": 25, "max_overflow": 25})
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options
+
+    # Initialize extensions
+    db.init_app(app)
+    if is_sqlite and app.config.get("SQLITE_FAST_PRAGMAS"):
+        with app.app_context():
+            event.listen(db.engine, "connect", _set_sqlite_pragmas)
+    _fork_safe_apps.add(app)
+    if _wants_migrations():
+        init_migrations(app)
+    bcrypt.init_app(app)
+    login_manager.init_app(app)
+    limiter.init_app(app)
+    if serve_http:
+        init_http_extensions(app)
+
+    if not app.debug and not app.testing:
+        configure_logging(app)
+
+    # Configure login manager
+    login_manager.login_view = "auth.login"
+    login_manager.login_message = "Please log in to access this page."
+    login_manager.login_message_category = "info"
+
+    # Ensure upload folder exists
+    os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
+
+    # Register blueprints
+    app.register_blueprint(auth_blueprint)
+    app.register_blueprint(main_blueprint)
+
+    if app.config.get("CREATE_DB_ON_STARTUP"):
+        with app.app_context():
+            db.create_all()
+
+    # Define routes
+    @app.route("/")
+    def index():
+        """Render the index page."""
+        return render_template("index.html")
+
+    return app
+
+
+def init_db() -> None:
+    """Create the database tables and seed the default admin and products."""
+    app = create_app(serve_http=False)
+
+    with app.app_context():
+        db.create_all()
+
+        # Run every existence check before any write, so the session has
+        # nothing pending to autoflush between queries.
+        with db.session.no_autoflush:
+            has_admin = db.session.scalar(
+                db.select(db.exists().where(User.email == "admin@example.com"))
+            )
+            seed_names = [product["name"] for product in SEED_PRODUCTS]
+            existing = set(
+                db.session.scalars(
+                    db.select(Product.name).filter(Product.name.in_(seed_names))
+                )
+            )
+
+        missing = [p for p in SEED_PRODUCTS if p["name"] not in existing]
+        if has_admin and not missing:
+            return
+
+        # Seed default admin user
+        if not has_admin:
+            admin = User(username="admin", email="admin@example.com", is_admin=True)
+            admin.set_password("admin123")
+            db.session.add(admin)
+
+        # Seed sample products in a single multi-row INSERT
+        if missing:
+            db.session.execute(Product.__table__.insert(), missing)
+
+        db.session.commit()
@@ -6,7 +6,9 @@ password reset, and account management.
 """
 
 # Standard library imports
+import os
 import smtplib
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 
 # Third-party imports
 from flask import (
@@ -23,18 +25,49 @@ from sqlalchemy.exc import SQLAlchemyError
 
 # Local imports
 from models import User
-from extensions import db
+from extensions import db, limiter, remote_address
 from utils.security import log_security_event
+from utils.urls import cached_url
 
 # Create auth blueprint
 auth = Blueprint("auth", __name__, template_folder="templates/auth")
 
+# bcrypt releases the GIL, so password checks run on a bounded pool of
+# threads instead of tying up the request thread for the whole hash
+_bcrypt_executor = ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2)
+PASSWORD_CHECK_TIMEOUT = 5
+LOGIN_RATE_LIMIT = "5/minute"
+
+
+def _check_password(user, password):
+    """Verify a password on the bcrypt thread pool.
+
+    Args:
+        user (User): The user whose password hash is checked.
+        password (str): The plain text password to check.
+
+    Returns:
+        bool: True if the password matches, False otherwise or on timeout.
+    """
+    future = _bcrypt_executor.submit(user.check_password, password)
+    try:
+        return future.result(timeout=PASSWORD_CHECK_TIMEOUT)
+    except FutureTimeout:
+        current_app.logger.error("Timed out verifying password for user %s", user.id)
+        return False
+
+
+def _login_rate_key():
+    """Rate-limit login attempts per email address and client address."""
+    return f"{request.form.get('email') or ''}|{remote_address()}"
+
 
 @auth.route("/login", methods=["GET", "POST"])
+@limiter.limit(LOGIN_RATE_LIMIT, methods=["POST"], key_func=_login_rate_key)
 def login():
     """Handle user login."""
     if current_user.is_authenticated:
-        return redirect(url_for("main.index"))
+        return redirect(cached_url("main.index"))
 
     if request.method == "POST":
         email = request.form.get("email")
@@ -43,11 +76,11 @@ def login():
 
         user = User.query.filter_by(email=email).first()
 
-        if user and user.check_password(password):
+        if user and _check_password(user, password):
             login_user(user, remember=remember)
             log_security_event("login", f"User {user.id} logged in", user.id)
             flash("Logged in successfully.", "success")
-            return redirect(url_for("main.index"))
+            return redirect(cached_url("main.index"))
 
         log_security_event("login_failed", f"Failed login attempt for {email}")
         flash(
@@ -69,7 +102,7 @@ def register():
         # Check if the user already exists
         if User.query.filter_by(email=email).first():
             flash("Email already registered.", "error")
-            return redirect(url_for("auth.register"))
+            return redirect(cached_url("auth.register"))
 
         # Create a new user
         user = User(username=username, email=email)
@@ -78,7 +111,7 @@ def register():
         db.session.commit()
 
         flash("Registration successful! Please log in.", "success")
-        return redirect(url_for("auth.login"))
+        return redirect(cached_url("auth.login"))
 
     return render_template("auth/register.html")
 
@@ -95,14 +128,14 @@ def logout():
 
     logout_user()
     flash("Logged out successfully.", "success")
-    return redirect(url_for("main.index"))
+    return redirect(cached_url("main.index"))
 
 
 @auth.route("/reset_password_request", methods=["GET", "POST"])
 def reset_password_request():
     """Handle password reset request."""
     if current_user.is_authenticated:
-        return redirect(url_for("main.index"))
+        return redirect(cached_url("main.index"))
 
     if request.method == "POST":
         email = request.form.get("email")
@@ -110,10 +143,14 @@ def reset_password_request():
 
         if user:
             token = user.generate_reset_token()
+            db.session.commit()
             reset_url = url_for("auth.reset_password", token=token, _external=True)
 
+            mail = current_app.extensions.get("mail")
             try:
-                current_app.mail.send_message(
+                if mail is None:
+                    raise smtplib.SMTPException("mail extension is not enabled")
+                mail.send_message(
                     "Password Reset Request",
                     recipients=[user.email],
                     body=(
@@ -130,12 +167,10 @@ def reset_password_request():
                     "Password reset instructions sent to your email address.",
                     "info",
                 )
-                return redirect(url_for("auth.login"))
+                return redirect(cached_url("auth.login"))
 
             except smtplib.SMTPException as e:
-                current_app.logger.error(
-                    f"SMTP error while sending reset email: {str(e)}"
-                )
+                current_app.logger.error("SMTP error while sending reset email: %s", e)
                 flash(
                     "Error sending reset email. Please try again.",
                     "error",
@@ -150,12 +185,12 @@ def reset_password_request():
 def reset_password(token):
     """Handle password reset."""
     if current_user.is_authenticated:
-        return redirect(url_for("main.index"))
+        return redirect(cached_url("main.index"))
 
     user = User.verify_reset_token(token)
     if not user:
         flash("Invalid or expired reset token.", "error")
-        return redirect(url_for("auth.reset_password_request"))
+        return redirect(cached_url("auth.reset_password_request"))
 
     if request.method == "POST":
         password = request.form.get("password")
@@ -170,7 +205,8 @@ def reset_password(token):
 
         try:
             user.set_password(password)
-            current_app.db.session.commit()
+            user.clear_reset_token()
+            db.session.commit()
             log_security_event(
                 "password_reset",
                 f"Password reset for {user.email}",
@@ -180,11 +216,11 @@ def reset_password(token):
                 "Your password has been reset successfully. You can now log in.",
                 "success",
             )
-            return redirect(url_for("auth.login"))
+            return redirect(cached_url("auth.login"))
 
         except SQLAlchemyError as e:
-            current_app.db.session.rollback()
-            current_app.logger.error(f"Database error during password reset: {str(e)}")
+            db.session.rollback()
+            current_app.logger.error("Database error during password reset: %s", e)
             flash(
                 "An error occurred during password reset.",
                 "error",
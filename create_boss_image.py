@@ -6,12 +6,20 @@ and save them locally.
 """
 
 import os
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 
 # Configuration constants
 OUTPUT_DIRECTORY = "static/uploads"
 FONT_PATH = "static/fonts/arial.ttf"
 FONT_SIZE = 36
+JPEG_QUALITY = 85
+
+
+@lru_cache(maxsize=None)
+def _load_font(font_path, font_size):
+    """Load a TrueType font once per path and size."""
+    return ImageFont.truetype(font_path, font_size)
 
 
 def create_boss_image(image_id, boss_name, boss_level):
@@ -36,7 +44,7 @@ def create_boss_image(image_id, boss_name, boss_level):
         draw = ImageDraw.Draw(image)
 
         # Load font
-        font = ImageFont.truetype(FONT_PATH, FONT_SIZE)
+        font = _load_font(FONT_PATH, FONT_SIZE)
 
         # Add text to the image
         draw.text(
@@ -48,7 +56,14 @@ def create_boss_image(image_id, boss_name, boss_level):
 
         # Save the image
         output_path = os.path.join(OUTPUT_DIRECTORY, f"boss_{image_id}.jpg")
-        image.save(output_path)
+        image.save(
+            output_path,
+            "JPEG",
+            quality=JPEG_QUALITY,
+            subsampling=2,
+            optimize=False,
+            progressive=False,
+        )
 
         return True
     except IOError as e:
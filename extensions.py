@@ -1,18 +1,71 @@
+from flask import g, request
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_login import LoginManager
-from flask_session import Session
-from flask_cors import CORS
 from flask_limiter import Limiter
-from flask_mail import Mail
-from flask_limiter.util import get_remote_address
+
+
+def remote_address():
+    """Return the client address for rate limiting, cached per request.
+
+    Reads ``REMOTE_ADDR`` from the WSGI environ, which ProxyFix rewrites
+    when the app runs behind a trusted proxy. ``X-Forwarded-For`` is not
+    read directly because clients can forge it.
+    """
+    address = g.get("_remote_address")
+    if address is None:
+        address = g._remote_address = request.environ.get("REMOTE_ADDR") or "127.0.0.1"
+    return address
+
 
 db = SQLAlchemy()
-migrate = Migrate()
 login_manager = LoginManager()
-session = Session()
-cors = CORS()
-limiter = Limiter(key_func=get_remote_address)
-mail = Mail()
+limiter = Limiter(key_func=remote_address)
+
+
+def init_migrations(app):
+    """Register the Flask-Migrate ``flask db`` commands on the app.
+
+    Alembic is only imported here, so processes that never run
+    migrations do not load it.
+
+    Args:
+        app: The Flask application to initialise.
+    """
+    from flask_migrate import Migrate  # pylint: disable=import-outside-toplevel
+
+    Migrate(app, db)
+
+
+def init_http_extensions(app):
+    """Initialise the extensions that are only needed to serve HTTP.
+
+    The imports are deferred so CLI and seeding entry points that never
+    serve requests do not pay for them.
+
+    Args:
+        app: The Flask application to initialise.
+    """
+    # pylint: disable=import-outside-toplevel
+    from flask_session import Session
+    from flask_wtf.csrf import CSRFProtect
+
+    if app.config.get("SESSION_TYPE") == "redis" and not app.config.get(
+        "SESSION_REDIS"
+    ):
+        if not app.config.get("REDIS_URL"):
+            raise RuntimeError("SESSION_TYPE is 'redis' but REDIS_URL is not set.")
+        import redis
+
+        app.config["SESSION_REDIS"] = redis.from_url(app.config["REDIS_URL"])
+    Session(app)
+    CSRFProtect(app)
+
+    if app.config.get("ENABLE_CORS", True):
+        from flask_cors import CORS
+
+        CORS(app)
+
+    if app.config.get("ENABLE_MAIL", True):
+        from flask_mail import Mail
 
-#test
\ No newline at end of file
+        Mail(app)
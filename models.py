@@ -3,14 +3,23 @@
 This module defines the SQLAlchemy models for users, products, and orders.
 """
 
-from datetime import datetime
+import hashlib
+import secrets
+from datetime import datetime, timedelta
 from extensions import db
 from flask_login import UserMixin
 from flask_bcrypt import Bcrypt
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
 
 bcrypt = Bcrypt()
 
+RESET_TOKEN_LIFETIME = timedelta(hours=1)
+
+
+def _hash_reset_token(token):
+    """Return the digest stored for a password reset token."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
 
 class User(UserMixin, db.Model):
     """
@@ -33,7 +42,7 @@ class User(UserMixin, db.Model):
     email = db.Column(db.String(120), nullable=False, unique=True)
     password_hash = db.Column(db.String(128))
     reset_token = db.Column(db.String(100), unique=True)
-    reset_token_expiry = db.Column(db.DateTime)
+    reset_token_expiry = db.Column(db.DateTime, index=True)
     is_admin = db.Column(db.Boolean, default=False)
     orders = db.relationship("Order", backref="user", lazy=True)
 
@@ -48,7 +57,7 @@ class User(UserMixin, db.Model):
         Args:
             password (str): The plain text password to hash
         """
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = bcrypt.generate_password_hash(password).decode("utf-8")
 
     def check_password(self, password):
         """
@@ -60,8 +69,51 @@ class User(UserMixin, db.Model):
         Returns:
             bool: True if password matches, False otherwise
         """
+        if not self.password_hash:
+            return False
+        if self.password_hash.startswith("$2"):
+            return bcrypt.check_password_hash(self.password_hash, password)
+        # Hashes created before the switch to bcrypt
         return check_password_hash(self.password_hash, password)
 
+    def generate_reset_token(self):
+        """
+        Create a new password reset token for the user.
+
+        Only a digest of the token is stored, so the token itself must be
+        delivered to the user straight away.
+
+        Returns:
+            str: The reset token
+        """
+        token = secrets.token_urlsafe(32)
+        self.reset_token = _hash_reset_token(token)
+        self.reset_token_expiry = datetime.utcnow() + RESET_TOKEN_LIFETIME
+        return token
+
+    def clear_reset_token(self):
+        """Invalidate the user's password reset token."""
+        self.reset_token = None
+        self.reset_token_expiry = None
+
+    @staticmethod
+    def verify_reset_token(token):
+        """
+        Look up the user owning a valid password reset token.
+
+        Args:
+            token (str): The reset token from the reset URL
+
+        Returns:
+            User: The matching user, or None if the token is unknown or expired
+        """
+        user = User.query.filter_by(reset_token=_hash_reset_token(token)).first()
+        if user is None or user.reset_token_expiry is None:
+            return None
+        if user.reset_token_expiry < datetime.utcnow():
+            return None
+        return user
+
     def get_active_orders(self):
         """
         Get all active orders for this user.
@@ -91,7 +143,7 @@ class Product(db.Model):
     price = db.Column(db.Float, nullable=False)
     stock = db.Column(db.Integer, default=0)
     featured = db.Column(db.Boolean, default=False)
-    order_items = db.relationship("OrderItem", backref="product", lazy=True)
+    order_items = db.relationship("OrderItem", back_populates="product", lazy=True)
 
     def __repr__(self):
         """Return a string representation of the product."""
@@ -101,6 +153,9 @@ class Product(db.Model):
         """
         Update the product's stock quantity.
 
+        The change is applied with a single conditional UPDATE, so concurrent
+        orders cannot oversell the product.
+
         Args:
             quantity (int): The quantity to add (positive) or remove (negative)
 
@@ -108,9 +163,14 @@ class Product(db.Model):
             bool: True if update was successful, False if resulting stock would
             be negative
         """
-        new_stock = self.stock + quantity
-        if new_stock >= 0:
-            self.stock = new_stock
+        result = db.session.execute(
+            db.update(Product)
+            .where(Product.id == self.id, Product.stock + quantity >= 0)
+            .values(stock=Product.stock + quantity)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            db.session.expire(self, ["stock"])
             return True
         return False
 
@@ -140,7 +200,10 @@ class Order(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     date_ordered = db.Column(db.DateTime, default=datetime.utcnow)
     status = db.Column(db.String(20), default="pending")
-    items = db.relationship("OrderItem", backref="order", lazy=True)
+    items = db.relationship("OrderItem", backref="order", lazy="selectin")
+
+    # Serves get_active_orders() and any lookup by user_id alone
+    __table_args__ = (db.Index("ix_order_user_status", "user_id", "status"),)
 
     def __repr__(self):
         """Return a string representation of the order."""
@@ -153,7 +216,7 @@ class Order(db.Model):
         Returns:
             float: Total cost of all items in the order
         """
-        return sum(item.price * item.quantity for item in self.items)
+        return sum(item.subtotal for item in self.items)
 
     def update_status(self, new_status):
         """
@@ -191,18 +254,24 @@ class OrderItem(db.Model):
     """
 
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey("order.id"), nullable=False)
-    product_id = db.Column(db.Integer, db.ForeignKey("product.id"), nullable=False)
+    order_id = db.Column(
+        db.Integer, db.ForeignKey("order.id"), nullable=False, index=True
+    )
+    product_id = db.Column(
+        db.Integer, db.ForeignKey("product.id"), nullable=False, index=True
+    )
     quantity = db.Column(db.Integer, nullable=False)
     price = db.Column(db.Float, nullable=False)
+    product = db.relationship("Product", back_populates="order_items", lazy="joined")
 
     def __repr__(self):
         """Return a string representation of the order item."""
         return f"<OrderItem {self.id}>"
 
-    def get_subtotal(self):
+    @property
+    def subtotal(self):
         """
-        Calculate the subtotal for this order item.
+        Subtotal for this order item.
 
         Returns:
             float: Subtotal (price * quantity)
@@ -10,7 +10,10 @@ Routes are organized into logical sections:
 """
 
 # Standard library imports
-from typing import Union
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Tuple, Union
 
 # Third-party imports
 from flask import (
@@ -23,14 +26,20 @@ from flask import (
     flash,
     current_app,
     Response,
+    stream_template,
+    abort,
 )
 from flask_login import login_required, current_user
+from sqlalchemy import event
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import selectinload
 
 # Local imports
+from extensions import db
 from models import Product, Order, OrderItem
 from utils.cart import (
     get_cart_items,
+    get_product,
     add_to_cart,
     update_cart_item,
     remove_from_cart,
@@ -40,6 +49,7 @@ from utils.security import (
     require_https,
     log_security_event,
 )
+from utils.urls import cached_url
 
 # Create the Flask app
 app = Flask(__name__)
@@ -50,11 +60,52 @@ app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///some_very_long_database_path.
 # Create main blueprint
 main = Blueprint("main", __name__)
 
+GST_RATE = 0.18
+
+# Featured products rarely change, so the fields the home page renders
+# are cached briefly per app as plain dicts. Stock is left out: it changes
+# with every order and is read from the product page instead.
+FEATURED_PRODUCTS_TTL = 60
+FEATURED_PRODUCT_FIELDS = ("id", "name", "description", "price")
+_featured_cache: "weakref.WeakKeyDictionary[Flask, Tuple[float, List[Dict]]]" = (
+    weakref.WeakKeyDictionary()
+)
+_featured_lock = threading.Lock()
+
 # ============================================================================
 # Product Display Routes
 # ============================================================================
 
 
+def get_featured_products() -> List[Dict[str, Any]]:
+    """Return the featured products, cached for ``FEATURED_PRODUCTS_TTL`` seconds.
+
+    Returns:
+        List[Dict[str, Any]]: The featured products' display fields.
+    """
+    app = current_app._get_current_object()  # pylint: disable=protected-access
+    with _featured_lock:
+        expires, products = _featured_cache.get(app, (0.0, []))
+    if expires > time.monotonic():
+        return products
+
+    columns = [getattr(Product, field) for field in FEATURED_PRODUCT_FIELDS]
+    rows = db.session.execute(db.select(*columns).filter_by(featured=True))
+    products = [dict(zip(FEATURED_PRODUCT_FIELDS, row)) for row in rows]
+    with _featured_lock:
+        _featured_cache[app] = (time.monotonic() + FEATURED_PRODUCTS_TTL, products)
+    return products
+
+
+@event.listens_for(Product, "after_insert")
+@event.listens_for(Product, "after_update")
+@event.listens_for(Product, "after_delete")
+def invalidate_featured_products(*_args) -> None:
+    """Drop the cached featured products after a product is written."""
+    with _featured_lock:
+        _featured_cache.clear()
+
+
 @main.route("/")
 def index() -> str:
     """Display the home page with featured products.
@@ -62,8 +113,7 @@ def index() -> str:
     Returns:
         str: Rendered template for the home page with featured products.
     """
-    products = Product.query.filter_by(featured=True).all()
-    return render_template("index.html", products=products)
+    return render_template("index.html", products=get_featured_products())
 
 
 @main.route("/product/<int:product_id>")
@@ -76,7 +126,7 @@ def product_detail(product_id: int) -> str:
     Returns:
         str: Rendered template for the product detail page.
     """
-    product = Product.query.get_or_404(product_id)
+    product = db.get_or_404(Product, product_id)
     return render_template("product_detail.html", product=product)
 
 
@@ -90,12 +140,41 @@ def product_detail(product_id: int) -> str:
 def cart() -> str:
     """Display the user's shopping cart.
 
+    Totals are accumulated by the template while it renders the items.
+
+    Returns:
+        str: Rendered template for the cart page with cart items.
+    """
+    return render_template(
+        "cart.html", cart=get_cart_items(), gst_rate=GST_RATE, zip=zip
+    )
+
+
+def _cart_op(
+    operation: Callable[[], bool], success: str, failure: str, action: str
+) -> Response:
+    """Run a cart operation, flash its outcome and redirect.
+
+    Args:
+        operation (Callable[[], bool]): The cart operation to run.
+        success (str): Message flashed when the operation succeeds.
+        failure (str): Message flashed when the operation fails.
+        action (str): Description used in database error messages,
+            e.g. "updating" or "removing from".
+
     Returns:
-        str: Rendered template for the cart page with cart items and total.
+        Response: Redirect to the cart page, or the index on database errors.
     """
-    cart_items = get_cart_items()
-    total = sum(item["price"] * item["quantity"] for item in cart_items)
-    return render_template("cart.html", cart_items=cart_items, total=total)
+    try:
+        if operation():
+            flash(success, "success")
+        else:
+            flash(failure, "error")
+        return redirect(cached_url("main.cart"))
+    except SQLAlchemyError as e:
+        current_app.logger.error("Database error %s cart: %s", action, e)
+        flash(f"An error occurred while {action} cart.", "error")
+        return redirect(cached_url("main.index"))
 
 
 @main.route("/add_to_cart/<int:product_id>", methods=["POST"])
@@ -110,7 +189,9 @@ def add_to_cart_route(product_id: int) -> Response:
         Response: Redirect response to cart or product page.
     """
     try:
-        product = Product.query.get_or_404(product_id)
+        product = get_product(product_id)
+        if product is None:
+            abort(404)
         quantity = int(request.form.get("quantity", 1))
 
         if quantity <= 0:
@@ -121,14 +202,14 @@ def add_to_cart_route(product_id: int) -> Response:
         else:
             flash("Failed to add product to cart.", "error")
 
-        return redirect(url_for("main.cart"))
+        return redirect(cached_url("main.cart"))
     except ValueError:
         flash("Invalid quantity format.", "error")
         return redirect(url_for("main.product_detail", product_id=product_id))
     except SQLAlchemyError as e:
-        current_app.logger.error(f"Database error adding to cart: {str(e)}")
+        current_app.logger.error("Database error adding to cart: %s", e)
         flash("An error occurred while adding to cart.", "error")
-        return redirect(url_for("main.index"))
+        return redirect(cached_url("main.index"))
 
 
 @main.route("/update_cart/<int:product_id>", methods=["POST"])
@@ -144,26 +225,23 @@ def update_cart_route(product_id: int) -> Response:
     """
     try:
         quantity = int(request.form.get("quantity", 0))
-
-        if quantity <= 0:
-            if remove_from_cart(product_id):
-                flash("Product removed from cart.", "success")
-            else:
-                flash("Failed to remove product from cart.", "error")
-        else:
-            if update_cart_item(product_id, quantity):
-                flash("Cart updated.", "success")
-            else:
-                flash("Failed to update cart.", "error")
-
-        return redirect(url_for("main.cart"))
     except ValueError:
         flash("Invalid quantity format.", "error")
-        return redirect(url_for("main.cart"))
-    except SQLAlchemyError as e:
-        current_app.logger.error(f"Database error updating cart: {str(e)}")
-        flash("An error occurred while updating cart.", "error")
-        return redirect(url_for("main.index"))
+        return redirect(cached_url("main.cart"))
+
+    if quantity <= 0:
+        return _cart_op(
+            lambda: remove_from_cart(product_id),
+            "Product removed from cart.",
+            "Failed to remove product from cart.",
+            "updating",
+        )
+    return _cart_op(
+        lambda: update_cart_item(product_id, quantity),
+        "Cart updated.",
+        "Failed to update cart.",
+        "updating",
+    )
 
 
 @main.route("/remove_from_cart/<int:product_id>", methods=["POST"])
@@ -177,17 +255,12 @@ def remove_from_cart_route(product_id: int) -> Response:
     Returns:
         Response: Redirect response to cart page.
     """
-    try:
-        if remove_from_cart(product_id):
-            flash("Product removed from cart.", "success")
-        else:
-            flash("Failed to remove product from cart.", "error")
-
-        return redirect(url_for("main.cart"))
-    except SQLAlchemyError as e:
-        current_app.logger.error(f"Database error removing from cart: {str(e)}")
-        flash("An error occurred while removing from cart.", "error")
-        return redirect(url_for("main.index"))
+    return _cart_op(
+        lambda: remove_from_cart(product_id),
+        "Product removed from cart.",
+        "Failed to remove product from cart.",
+        "removing from",
+    )
 
 
 # ============================================================================
@@ -201,6 +274,89 @@ def remove_from_cart_route(product_id: int) -> Response:
 def checkout() -> Union[str, Response]:
     """Handle the checkout process."""
     if request.method == "POST":
-        # Process the checkout form
-        pass
-    return render_template("checkout.html")
\ No newline at end of file
+        view = get_cart_items()
+        if not view.ids:
+            flash("Your cart is empty.", "error")
+            return redirect(cached_url("main.cart"))
+
+        try:
+            # Reserve stock with one conditional UPDATE per line, in ID order
+            # so concurrent checkouts lock rows consistently
+            lines = sorted(zip(view.ids, view.names, view.quantities))
+            unavailable = [
+                name
+                for product_id, name, quantity in lines
+                if not get_product(product_id).update_stock(-quantity)
+            ]
+            if unavailable:
+                db.session.rollback()
+                flash(f"Not enough stock for: {', '.join(unavailable)}.", "error")
+                return redirect(cached_url("main.cart"))
+
+            user_id = current_user.id
+            order = Order(user_id=user_id)
+            db.session.add(order)
+            db.session.flush()  # Assigns order.id for the item rows
+            # Read before commit: expire_on_commit would reload the order
+            # (and its selectin items) on the next attribute access
+            order_id = order.id
+
+            # Insert every line in one executemany round-trip
+            db.session.execute(
+                OrderItem.__table__.insert(),
+                [
+                    {
+                        "order_id": order_id,
+                        "product_id": view.ids[i],
+                        "quantity": view.quantities[i],
+                        "price": view.prices[i],
+                    }
+                    for i in range(len(view.ids))
+                ],
+            )
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            current_app.logger.error("Database error during checkout: %s", e)
+            flash("An error occurred while placing your order.", "error")
+            return redirect(cached_url("main.cart"))
+
+        clear_cart()
+        log_security_event("order_placed", f"Order {order_id} placed", user_id)
+        flash("Order placed successfully.", "success")
+        return redirect(url_for("main.order_confirmation", order_id=order_id))
+
+    return render_template("checkout.html")
+
+
+@main.route("/order_confirmation/<int:order_id>")
+@login_required
+def order_confirmation(order_id: int) -> Response:
+    """Display the confirmation page for one of the user's orders.
+
+    The order's items and their products are loaded up front, so rendering
+    the item table issues no further queries. The page is streamed so the
+    first bytes go out before large orders finish rendering.
+
+    Args:
+        order_id (int): The ID of the order to display.
+
+    Returns:
+        Response: Streamed order confirmation page.
+    """
+    order = db.first_or_404(
+        db.select(Order)
+        .options(selectinload(Order.items).joinedload(OrderItem.product))
+        .filter_by(id=order_id, user_id=current_user.id)
+    )
+    subtotal = order.get_total()
+    tax = subtotal * GST_RATE
+    return current_app.response_class(
+        stream_template(
+            "order_confirmation.html",
+            order=order,
+            subtotal=subtotal,
+            tax=tax,
+            total=subtotal + tax,
+        )
+    )
\ No newline at end of file
@@ -5,53 +5,114 @@ This module provides functions for managing the shopping cart,
 including adding, updating, and removing items.
 """
 
-from typing import Dict, List
-from flask import session
+from operator import mul
+from typing import Dict, List, NamedTuple, Optional
+from flask import g, session
+from extensions import db
 from models import Product
 from sqlalchemy.exc import SQLAlchemyError
 
 
-def get_cart() -> Dict:
+class CartView(NamedTuple):
+    """Cart contents as parallel columns, one entry per line item."""
+
+    ids: List[int]
+    names: List[str]
+    prices: List[float]
+    quantities: List[int]
+
+
+def get_cart() -> Dict[int, int]:
     """Get the current cart from the session.
 
+    The session stores product IDs as strings; they are decoded to ints
+    once here so the rest of the module works with native IDs.
+
     Returns:
-        Dict: The current cart dictionary.
+        Dict[int, int]: A copy of the cart mapping product IDs to quantities.
     """
-    return session.get("cart", {})
+    return {int(product_id): qty for product_id, qty in session.get("cart", {}).items()}
 
 
-def save_cart(cart: Dict) -> None:
+def save_cart(cart: Dict[int, int]) -> None:
     """Save the cart to the session.
 
     Args:
-        cart (Dict): The cart dictionary to save.
+        cart (Dict[int, int]): The cart mapping product IDs to quantities.
     """
-    session["cart"] = cart
+    session["cart"] = {str(product_id): qty for product_id, qty in cart.items()}
+    g.pop("cart_items", None)
 
 
-def get_cart_items() -> List[Dict]:
+def get_cart_items() -> CartView:
     """Get all items in the cart with their details.
 
     Returns:
-        List[Dict]: List of cart items with product details.
+        CartView: The cart's line items as parallel columns, one list per
+        field.
     """
+    # Built at most once per request; save_cart() drops the cached copy
+    if "cart_items" in g:
+        return g.cart_items
+
+    view = CartView([], [], [], [])
     cart = get_cart()
-    items = []
+    products_by_id = _load_cart_products(cart) if cart else {}
 
     for product_id, quantity in cart.items():
-        product = Product.query.get(product_id)
+        product = products_by_id.get(product_id)
         if product:
-            items.append(
-                {
-                    "id": product.id,
-                    "name": product.name,
-                    "price": product.price,
-                    "quantity": quantity,
-                    "image": product.image,
-                }
-            )
+            view.ids.append(product.id)
+            view.names.append(product.name)
+            view.prices.append(product.price)
+            view.quantities.append(quantity)
+
+    g.cart_items = view
+    return view
+
+
+def _product_cache() -> Dict[int, Optional[Product]]:
+    """Return the request's product lookup cache, keyed by product ID."""
+    return g.setdefault("_product_cache", {})
+
+
+def get_product(product_id: int) -> Optional[Product]:
+    """Get a product, reusing any lookup already made in this request.
+
+    Args:
+        product_id (int): The ID of the product to get.
+
+    Returns:
+        Optional[Product]: The product, or None if it does not exist.
+    """
+    cache = _product_cache()
+    if product_id not in cache:
+        cache[product_id] = db.session.get(Product, product_id)
+    return cache[product_id]
+
 
-    return items
+def _load_cart_products(cart: Dict[int, int]) -> Dict[int, Product]:
+    """Load every product in the cart with a single IN query.
+
+    Products already looked up in this request are not queried again.
+
+    Args:
+        cart (Dict[int, int]): The cart mapping product IDs to quantities.
+
+    Returns:
+        Dict[int, Product]: The products found, keyed by ID.
+    """
+    cache = _product_cache()
+    missing = [product_id for product_id in cart if product_id not in cache]
+    if missing:
+        cache.update(dict.fromkeys(missing))
+        for product in Product.query.filter(Product.id.in_(missing)):
+            cache[product.id] = product
+    return {
+        product_id: cache[product_id]
+        for product_id in cart
+        if cache[product_id] is not None
+    }
 
 
 def add_to_cart(product: Product, quantity: int) -> bool:
@@ -65,18 +126,14 @@ def add_to_cart(product: Product, quantity: int) -> bool:
         bool: True if successful, False otherwise.
     """
     try:
+        if not quantity:
+            return True
         cart = get_cart()
-        product_id = str(product.id)
-
-        if product_id in cart:
-            cart[product_id] += quantity
-        else:
-            cart[product_id] = quantity
-
+        cart[product.id] = cart.get(product.id, 0) + quantity
         save_cart(cart)
         return True
     except (SQLAlchemyError, ValueError, TypeError):
-        session["cart"] = get_cart()  # Restore cart on error
+        # get_cart() returns a copy, so the session is untouched on error
         return False
 
 
@@ -92,15 +149,16 @@ def update_cart_item(product_id: int, quantity: int) -> bool:
     """
     try:
         cart = get_cart()
-        product_id_str = str(product_id)
 
-        if product_id_str in cart:
-            cart[product_id_str] = quantity
+        if product_id not in cart:
+            return False
+        # Leave the session untouched when the quantity is unchanged
+        if cart[product_id] != quantity:
+            cart[product_id] = quantity
             save_cart(cart)
-            return True
-        return False
+        return True
     except (SQLAlchemyError, ValueError, TypeError):
-        session["cart"] = get_cart()  # Restore cart on error
+        # get_cart() returns a copy, so the session is untouched on error
         return False
 
 
@@ -115,21 +173,21 @@ def remove_from_cart(product_id: int) -> bool:
     """
     try:
         cart = get_cart()
-        product_id_str = str(product_id)
 
-        if product_id_str in cart:
-            del cart[product_id_str]
+        if product_id in cart:
+            del cart[product_id]
             save_cart(cart)
             return True
         return False
     except (SQLAlchemyError, ValueError, TypeError):
-        session["cart"] = get_cart()  # Restore cart on error
+        # get_cart() returns a copy, so the session is untouched on error
         return False
 
 
 def clear_cart() -> None:
     """Clear all items from the cart."""
-    save_cart({})
+    if session.get("cart"):
+        save_cart({})
 
 
 def get_cart_total() -> float:
@@ -138,5 +196,7 @@ def get_cart_total() -> float:
     Returns:
         float: The total cost of all items in the cart.
     """
-    items = get_cart_items()
-    return sum(item["price"] * item["quantity"] for item in items)
+    view = get_cart_items()
+    # Sum in integer cents so the total is exact, then convert once
+    cents = (round(price * 100) for price in view.prices)
+    return sum(map(mul, cents, view.quantities)) / 100
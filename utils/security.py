@@ -7,13 +7,29 @@ including password validation, file upload security, and event logging.
 
 import os
 import hashlib
+import hmac
+import logging
 import re
+import string
 from datetime import datetime
-from functools import wraps
-from typing import Callable, Optional
-from flask import request, current_app, session, redirect, url_for, flash
+from functools import lru_cache, wraps
+from typing import Callable, Optional, Tuple
+from flask import request, current_app, session, redirect, url_for, flash, g
 from werkzeug.utils import secure_filename
 
+# Character classes a password must draw from, checked with set operations
+_UPPER = frozenset(string.ascii_uppercase)
+_LOWER = frozenset(string.ascii_lowercase)
+_DIGITS = frozenset(string.digits)
+_SPECIAL = frozenset('!@#$%^&*(),.?":{}|<>')
+
+_RE_TAG = re.compile(r"<[^>]+>")
+# Names werkzeug's secure_filename would return unchanged (outside Windows)
+_RE_SAFE_FILENAME = re.compile(r"[A-Za-z0-9](?:[A-Za-z0-9_.-]{0,198}[A-Za-z0-9])?")
+_HTML_ESCAPES = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+)
+
 
 def validate_password(password: str) -> bool:
     """Validate password strength.
@@ -26,31 +42,42 @@ def validate_password(password: str) -> bool:
     """
     if len(password) < 8:
         return False
-    if not re.search(r"[A-Z]", password):
-        return False
-    if not re.search(r"[a-z]", password):
-        return False
-    if not re.search(r"\d", password):
-        return False
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
-        return False
-    return True
+    chars = set(password)
+    return not (
+        chars.isdisjoint(_UPPER)
+        or chars.isdisjoint(_LOWER)
+        or chars.isdisjoint(_DIGITS)
+        or chars.isdisjoint(_SPECIAL)
+    )
 
 
 def allowed_file(filename: str) -> bool:
     """Check if a file has an allowed extension.
 
+    Results are memoised for the current request, so checking the same
+    upload again from a later handler is a dict lookup.
+
     Args:
         filename (str): The name of the file to check.
 
     Returns:
         bool: True if file extension is allowed, False otherwise.
     """
-    return (
-        "." in filename
-        and filename.rsplit(".", 1)[1].lower()
-        in current_app.config["ALLOWED_EXTENSIONS"]
-    )
+    checked = g.setdefault("_allowed_files", {})
+    allowed = checked.get(filename)
+    if allowed is None:
+        start = filename.rfind(".") + 1
+        allowed = checked[filename] = (
+            start > 0
+            and filename[start:].lower() in current_app.config["ALLOWED_EXTENSIONS"]
+        )
+    return allowed
+
+
+@lru_cache(maxsize=1024)
+def _cached_secure_filename(filename: str) -> str:
+    """Return werkzeug's ``secure_filename`` for a name, memoised."""
+    return secure_filename(filename)
 
 
 def secure_filename_with_hash(filename: str) -> str:
@@ -67,9 +94,13 @@ def secure_filename_with_hash(filename: str) -> str:
     # Get the file extension
     ext = os.path.splitext(filename)[1]
     # Generate a hash of the original filename
-    hash_value = hashlib.md5(filename.encode()).hexdigest()[:8]
-    # Combine the hash with the original filename
-    secure_name = secure_filename(filename)
+    hash_value = hashlib.blake2b(filename.encode(), digest_size=4).hexdigest()
+    # Combine the hash with the original filename, skipping werkzeug's
+    # normalisation when the name is already safe
+    if os.name != "nt" and _RE_SAFE_FILENAME.fullmatch(filename):
+        secure_name = filename
+    else:
+        secure_name = _cached_secure_filename(filename)
     name_without_ext = os.path.splitext(secure_name)[0]
     return f"{name_without_ext}_{hash_value}{ext}"
 
@@ -79,16 +110,27 @@ def log_security_event(
 ) -> None:
     """Log a security-related event.
 
+    The message is formatted lazily by logging, and nothing is built
+    when the logger would discard INFO records. File output goes through
+    the app's queue-backed log handler, so this does not block on I/O.
+
     Args:
         event_type (str): The type of security event.
         message (str): The event message.
         user_id (Optional[int]): The ID of the user involved, if any.
     """
+    logger = current_app.logger
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
     timestamp = datetime.utcnow().isoformat()
-    log_message = f"[{timestamp}] {event_type}: {message}"
     if user_id:
-        log_message += f" (User ID: {user_id})"
-    current_app.logger.info(log_message)
+        msg = "[%s] %s: %s (User ID: %s)"
+        args: Tuple = (timestamp, event_type, message, user_id)
+    else:
+        msg = "[%s] %s: %s"
+        args = (timestamp, event_type, message)
+    logger.info(msg, *args)
 
 
 def require_https(f: Callable) -> Callable:
@@ -103,8 +145,11 @@ def require_https(f: Callable) -> Callable:
 
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not request.is_secure and not current_app.debug:
-            return redirect(request.url.replace("http://", "https://"))
+        if request.environ.get("wsgi.url_scheme") != "https" and not current_app.debug:
+            url = request.url
+            if url.startswith("http://"):
+                url = "https://" + url[7:]
+            return redirect(url)
         return f(*args, **kwargs)
 
     return decorated_function
@@ -113,6 +158,10 @@ def require_https(f: Callable) -> Callable:
 def validate_csrf_token(f: Callable) -> Callable:
     """Decorator to validate CSRF token for a route.
 
+    The session token is read once per request and kept on ``g`` for any
+    other decorated handlers in the chain, and is compared in constant
+    time.
+
     Args:
         f (Callable): The route function to decorate.
 
@@ -124,7 +173,14 @@ def validate_csrf_token(f: Callable) -> Callable:
     def decorated_function(*args, **kwargs):
         if request.method == "POST":
             token = request.form.get("csrf_token")
-            if not token or token != session.get("csrf_token"):
+            expected = g.get("_csrf_token")
+            if expected is None:
+                expected = g._csrf_token = session.get("csrf_token")
+            if (
+                not token
+                or not expected
+                or not hmac.compare_digest(str(token), str(expected))
+            ):
                 flash("Invalid CSRF token.", "error")
                 return redirect(url_for("main.index"))
         return f(*args, **kwargs)
@@ -144,11 +200,6 @@ def sanitize_input(text: str) -> str:
     if not text:
         return ""
     # Remove HTML tags
-    text = re.sub(r"<[^>]+>", "", text)
-    # Escape special characters
-    text = text.replace("&", "&amp;")
-    text = text.replace("<", "&lt;")
-    text = text.replace(">", "&gt;")
-    text = text.replace('"', "&quot;")
-    text = text.replace("'", "&#x27;")
-    return text
+    text = _RE_TAG.sub("", text)
+    # Escape special characters in a single pass
+    return text.translate(_HTML_ESCAPES)
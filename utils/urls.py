@@ -0,0 +1,28 @@
+"""
+URL helpers for the e-commerce application.
+
+This module caches the URLs of endpoints that take no arguments, so
+redirects to them do not rebuild the URL on every request.
+"""
+
+from typing import Dict, Tuple
+from flask import request, url_for
+
+# Built URLs for parameterless endpoints, keyed by (script root, endpoint)
+_url_cache: Dict[Tuple[str, str], str] = {}
+
+
+def cached_url(endpoint: str) -> str:
+    """Return ``url_for(endpoint)``, building it only once per script root.
+
+    Args:
+        endpoint (str): A URL endpoint that takes no arguments.
+
+    Returns:
+        str: The relative URL for the endpoint.
+    """
+    key = (request.script_root, endpoint)
+    url = _url_cache.get(key)
+    if url is None:
+        url = _url_cache[key] = url_for(endpoint)
+    return url